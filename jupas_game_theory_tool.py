@@ -1,6 +1,53 @@
+import functools
+import math
+from typing import NamedTuple
+
 import streamlit as st
 import numpy as np
 
+from mse_core import compute_mse
+
+
+# MSE existence bounds for K = V_B/V_C, and the midpoint used when
+# suggesting value adjustments
+K_LOWER = 0.75
+K_UPPER = 4/3
+K_MID = (K_LOWER + K_UPPER) / 2
+
+# Quick-example parameter presets, keyed by their sidebar button label
+_PRESETS = {
+    'Situation 4 (Default)': {
+        'N': 10000, 'S': 9000, 'group_A_prop': 0.3,
+        'V_A': 3.0, 'V_B': 2.0, 'V_C': 1.0,
+        'seat_prop_A': 1/3, 'seat_prop_B': 1/3, 'seat_prop_C': 1/3
+    },
+    'Situation 5 (MSE Example)': {
+        'N': 10000, 'S': 9000, 'group_A_prop': 0.3,
+        'V_A': 3.0, 'V_B': 1.2, 'V_C': 1.0,  # K = 1.2, within MSE range
+        'seat_prop_A': 1/3, 'seat_prop_B': 1/3, 'seat_prop_C': 1/3
+    },
+    'High Competition': {
+        'N': 15000, 'S': 9000, 'group_A_prop': 0.4,
+        'V_A': 5.0, 'V_B': 3.0, 'V_C': 1.5,
+        'seat_prop_A': 0.4, 'seat_prop_B': 0.4, 'seat_prop_C': 0.2
+    }
+}
+
+
+class Params(NamedTuple):
+    """Frozen analysis inputs. Hashable, so analysis results can be memoized
+    across Streamlit reruns (the script re-executes on every widget change)."""
+    N: int
+    S: int
+    group_A_prop: float
+    V_A: float
+    V_B: float
+    V_C: float
+    seat_prop_A: float
+    seat_prop_B: float
+    seat_prop_C: float
+
+
 # Initialize session state for parameters
 if 'params' not in st.session_state:
     st.session_state.params = {
@@ -15,148 +62,402 @@ if 'params' not in st.session_state:
         'seat_prop_C': 1/3
     }
 
-st.title("JUPAS Competition Analyzer")
-st.markdown("Analyze game-theoretic equilibrium in JUPAS-style admissions")
+# Static header: one markdown call instead of separate title + tagline
+st.markdown("# JUPAS Competition Analyzer\n"
+            "Analyze game-theoretic equilibrium in JUPAS-style admissions")
+
+# Sidebar widget layout: (section header, widget kind, param key, label,
+# min, max, step). One spec per input keeps the form body to a single loop.
+_WIDGET_SPECS = [
+    (None, 'number', 'N', "Total Applicants (N)", 1000, 50000, 1000),
+    (None, 'number', 'S', "Total Seats (S)", 100, 50000, 100),
+    (None, 'slider', 'group_A_prop', "Group A Proportion (More Competitive)",
+     0.1, 0.5, 0.05),
+    ("Programme Values", 'number', 'V_A', "Value of Type A", 1.0, 10.0, 0.1),
+    (None, 'number', 'V_B', "Value of Type B", 0.1, 10.0, 0.1),
+    (None, 'number', 'V_C', "Value of Type C", 0.1, 10.0, 0.1),
+    ("Seat Distribution", 'slider', 'seat_prop_A', "Proportion of seats in Type A",
+     0.0, 1.0, 0.05),
+    (None, 'slider', 'seat_prop_B', "Proportion of seats in Type B",
+     0.0, 1.0, 0.05),
+]
 
-# Sidebar for parameter inputs
-with st.sidebar:
+# Sidebar for parameter inputs. The form batches widget changes so the
+# analysis reruns once per "Apply" instead of on every slider tick.
+with st.sidebar.form("params_form"):
     st.header("Parameters")
-    
-    # Basic parameters
-    N = st.number_input("Total Applicants (N)", min_value=1000, max_value=50000, 
-                       value=st.session_state.params['N'], step=1000)
-    S = st.number_input("Total Seats (S)", min_value=100, max_value=50000, 
-                       value=st.session_state.params['S'], step=100)
-    
-    # Group proportion
-    group_A_prop = st.slider("Group A Proportion (More Competitive)", 
-                            min_value=0.1, max_value=0.5, 
-                            value=float(st.session_state.params['group_A_prop']), 
-                            step=0.05)
-    
-    # Programme values
-    st.subheader("Programme Values")
-    V_A = st.number_input("Value of Type A", min_value=1.0, max_value=10.0, 
-                         value=float(st.session_state.params['V_A']), step=0.1)
-    V_B = st.number_input("Value of Type B", min_value=0.1, max_value=10.0, 
-                         value=float(st.session_state.params['V_B']), step=0.1)
-    V_C = st.number_input("Value of Type C", min_value=0.1, max_value=10.0, 
-                         value=float(st.session_state.params['V_C']), step=0.1)
-    
-    # Seat distribution
-    st.subheader("Seat Distribution")
-    seat_prop_A = st.slider("Proportion of seats in Type A", 
-                           min_value=0.0, max_value=1.0, 
-                           value=float(st.session_state.params['seat_prop_A']), step=0.05)
-    seat_prop_B = st.slider("Proportion of seats in Type B", 
-                           min_value=0.0, max_value=1.0, 
-                           value=float(st.session_state.params['seat_prop_B']), step=0.05)
-    seat_prop_C = 1.0 - seat_prop_A - seat_prop_B
+
+    inputs = {}
+    for section, kind, key, label, lo, hi, step in _WIDGET_SPECS:
+        if section:
+            st.subheader(section)
+        widget = st.number_input if kind == 'number' else st.slider
+        inputs[key] = widget(label, min_value=lo, max_value=hi,
+                             value=st.session_state.params[key], step=step)
+
+    seat_prop_C = 1.0 - inputs['seat_prop_A'] - inputs['seat_prop_B']
     st.markdown(f"**Proportion of seats in Type C:** {seat_prop_C:.2f}")
-    
+
     if seat_prop_C < 0:
         st.error("Seat proportions must sum to 1 or less!")
-    
-    # Update session state
-    st.session_state.params.update({
-        'N': N, 'S': S, 'group_A_prop': group_A_prop,
-        'V_A': V_A, 'V_B': V_B, 'V_C': V_C,
-        'seat_prop_A': seat_prop_A, 'seat_prop_B': seat_prop_B, 'seat_prop_C': seat_prop_C
+
+    st.form_submit_button("Apply")
+
+# Update session state (widgets report their values as of the last submit)
+inputs['seat_prop_C'] = seat_prop_C
+st.session_state.params.update(inputs)
+
+
+class Derived(NamedTuple):
+    """Quantities computed once per parameter tuple and shared by the steps."""
+    n_A: int
+    n_B: int
+    S_A: int
+    S_B: int
+    S_C: int
+    K: float            # V_B / V_C, also the switch threshold ratio
+    S_B_over_nB: float
+    S_C_over_nB: float
+
+
+@functools.lru_cache(maxsize=128)
+def _derived_quantities(params):
+    """Pure arithmetic: group sizes, seat counts and the recurring ratios.
+
+    The lru_cache only dedupes the repeated calls within one script run
+    (both analyze_group_* steps and the preset table ask for the same
+    tuples); it does not survive Streamlit reruns, which re-execute the
+    script and rebuild it. Skipping recomputation across reruns is done by
+    the st.cache_data layer on the callers.
+    """
+    counts = np.multiply(
+        [params.group_A_prop, params.seat_prop_A, params.seat_prop_B, params.seat_prop_C],
+        [params.N, params.S, params.S, params.S]
+    ).astype(np.int64)
+    n_A, S_A, S_B, S_C = counts.tolist()
+    n_B = params.N - n_A
+    return Derived(n_A, n_B, S_A, S_B, S_C,
+                   K=params.V_B / params.V_C,
+                   S_B_over_nB=S_B / n_B,
+                   S_C_over_nB=S_C / n_B)
+
+
+def _validation_error(params):
+    """Invariant checks, kept out of the arithmetic path.
+
+    Returns an error message for invalid input, None otherwise. Runs once
+    per script pass; caching it would buy nothing since Streamlit rebuilds
+    script-body functions (and any lru_cache on them) on every rerun.
+    """
+    if not (params.V_A > params.V_B > params.V_C):
+        return "Programme values must satisfy: V_A > V_B > V_C"
+    return None
+
+
+@st.cache_resource
+def _preset_table():
+    """K classification for each quick-example preset.
+
+    The presets are immutable, so this is computed once per process and
+    shared across sessions — preset captions render without re-analysis.
+    """
+    table = {}
+    for label, preset in _PRESETS.items():
+        d = _derived_quantities(Params(**preset))
+        if K_LOWER < d.K < K_UPPER:
+            regime = 'MSE'
+        elif d.K <= K_LOWER:
+            regime = 'corner (K too low)'
+        else:
+            regime = 'corner (K too high)'
+        table[label] = f"K = {d.K:.2f} → {regime}"
+    return table
+
+
+@st.cache_data
+def analyze_group_A(params):
+    """Pure Group A analysis: admission rate and expected payoff."""
+    d = _derived_quantities(params)
+    n_A, S_A = d.n_A, d.S_A
+
+    admission_rate = 1.0 if n_A <= S_A else S_A / n_A
+
+    return {
+        'n_A': n_A,
+        'S_A': S_A,
+        'admission_rate': admission_rate,
+        'expected_payoff': admission_rate * params.V_A
+    }
+
+
+@st.cache_data
+def analyze_group_B(params):
+    """Pure Group B analysis: MSE when K is in range, corner solutions otherwise."""
+    d = _derived_quantities(params)
+    n_B, S_B, S_C = d.n_B, d.S_B, d.S_C
+
+    K = d.K
+
+    result = {
+        'n_B': n_B,
+        'S_B': S_B,
+        'S_C': S_C,
+        'K': K,
+        'K_lower': K_LOWER,
+        'K_upper': K_UPPER
+    }
+
+    if K_LOWER < K < K_UPPER:
+        # Mixed strategy equilibrium
+        f, P_B, P_C, E_B, E_C, regime = compute_mse(n_B, S_B, S_C,
+                                                    params.V_B, params.V_C)
+        result.update({
+            'equilibrium_type': 'MSE',
+            'regime': regime,
+            'f': f,
+            'P_B': P_B,
+            'P_C': P_C,
+            'E_B': E_B,
+            'E_C': E_C
+        })
+        return result
+
+    # Corner solution analysis: symmetric moves
+    P_B_all = min(1.0, d.S_B_over_nB)
+    E_B_all = P_B_all * params.V_B
+
+    P_C_all = min(1.0, d.S_C_over_nB)
+    E_C_all = P_C_all * params.V_C
+
+    # Determine which corner is better
+    if E_B_all > E_C_all:
+        preferred = "Type B"
+        equilibrium_type = "corner_B"
+        admission_rate = P_B_all
+        expected_payoff = E_B_all
+    elif E_C_all > E_B_all:
+        preferred = "Type C"
+        equilibrium_type = "corner_C"
+        admission_rate = P_C_all
+        expected_payoff = E_C_all
+    else:
+        preferred = "Indifferent"
+        equilibrium_type = "multiple"
+        admission_rate = P_B_all
+        expected_payoff = E_B_all
+
+    # Asymmetric move analysis
+    threshold_ratio = d.K
+    # For a switch to be rational: P_C(x) > threshold_ratio × P_B(x)
+    # Sweep every possible number of switchers x in [1, n_B - 1] at once
+    x = np.arange(1, n_B, dtype=np.int64)
+    P_B_x = np.minimum(1.0, S_B / (n_B - x))
+    P_C_x = np.minimum(1.0, S_C / x)
+    switch_rational = P_C_x > threshold_ratio * P_B_x
+
+    x_switch_min = int(x[np.argmax(switch_rational)]) if switch_rational.any() else None
+
+    result.update({
+        'equilibrium_type': equilibrium_type,
+        'preferred_corner': preferred,
+        'admission_rate': admission_rate,
+        'expected_payoff': expected_payoff,
+        'P_B_all': P_B_all,
+        'E_B_all': E_B_all,
+        'P_C_all': P_C_all,
+        'E_C_all': E_C_all,
+        'threshold_ratio': threshold_ratio,
+        'x_switch_min': x_switch_min,
+        'required_V_B': K_MID * params.V_C,
+        'required_V_C': params.V_B / K_MID
     })
+    return result
+
+
+PROGRAMME_TYPES = ('Type A', 'Type B', 'Type C')
+
+
+@st.cache_data
+def _allocate_core(payoffs, seats, num_students):
+    """Greedily fill programme slots in descending payoff order.
+
+    Vectorized: argsort the payoffs once, then a cumsum gives the students
+    still unplaced when each slot starts filling — no Python loop. Takes
+    payoffs and seat counts as parallel tuples (one entry per programme
+    type) and returns the seats taken as an int64 array in the same order.
+    """
+    # The fixed 3-type case with ordered payoffs — the path every caller
+    # takes once V_A > V_B > V_C is validated — unrolls to straight-line
+    # min/subtract arithmetic, cheaper than the array machinery at this size.
+    # Seat counts can come in negative when the seat proportions sum above 1
+    # (seat_prop_C = 1 - A - B goes below zero); treat those types as empty
+    # rather than producing negative intakes.
+    if len(payoffs) == 3 and payoffs[0] >= payoffs[1] >= payoffs[2]:
+        a0 = min(num_students, max(0, seats[0]))
+        r = num_students - a0
+        a1 = min(r, max(0, seats[1]))
+        a2 = min(r - a1, max(0, seats[2]))
+        return np.array([a0, a1, a2], dtype=np.int64)
+
+    pv = np.asarray(payoffs)
+    sv = np.maximum(0, np.asarray(seats, dtype=np.int64))
+
+    # The validated ordering V_A > V_B > V_C means callers already pass
+    # payoffs in descending order, so the sort is usually the identity.
+    if pv.size < 2 or np.all(pv[:-1] >= pv[1:]):
+        order = None
+        s_ord = sv
+    else:
+        order = np.argsort(-pv)
+        s_ord = sv[order]
+
+    remaining = np.maximum(0, num_students - np.concatenate(([0], np.cumsum(s_ord)[:-1])))
+    taken = np.minimum(s_ord, remaining)
+
+    if order is not None:
+        inv = np.empty_like(order)
+        inv[order] = np.arange(pv.size)
+        taken = taken[inv]
+    return taken
+
+
+def allocate_seats(payoff, seats, num_students):
+    """Dict-keyed convenience wrapper around _allocate_core."""
+    types = list(payoff)
+    taken = _allocate_core(tuple(payoff[t] for t in types),
+                           tuple(seats[t] for t in types), num_students)
+    return dict(zip(types, taken.tolist()))
+
+
+@st.cache_data
+def _mse_frame(f, P_B, P_C, E_B, E_C):
+    """Equilibrium summary table, built from a pre-shaped float64 array so
+    pandas skips per-column dtype inference and copying."""
+    import pandas as pd  # deferred: only table rendering needs pandas
+
+    arr = np.array([[f, P_B, E_B],
+                    [1.0 - f, P_C, E_C]], dtype=np.float64)
+    return pd.DataFrame(arr, index=['Type B', 'Type C'],
+                        columns=['Fraction', 'Admission Probability',
+                                 'Expected Payoff'])
+
+
+@st.cache_data
+def _greedy_fill_frame(payoffs, seats, num_students):
+    """Greedy-fill intake as a one-row DataFrame, built straight from the
+    allocation array so pandas does no dtype inference or dict copying."""
+    import pandas as pd  # deferred: only table rendering needs pandas
+
+    alloc = _allocate_core(payoffs, seats, num_students)
+    return pd.DataFrame(alloc[None, :], index=['Seats filled'],
+                        columns=list(PROGRAMME_TYPES))
+
+
+def sweep_K(V_B_grid, V_C_grid, n_B, S_B, S_C):
+    """Vectorized Group B equilibrium sweep over (V_B, V_C) value grids.
+
+    Answers "which value pairs admit an MSE, and at what f/P_B/P_C?" in one
+    broadcast pass instead of a Python loop of per-pair analyses. Returns a
+    dict of arrays of shape (len(V_B_grid), len(V_C_grid)): K, mse_exists,
+    f, P_B, P_C — with corner-solution values filled in where no MSE exists.
+    """
+    V_B = np.asarray(V_B_grid, dtype=np.float64)[:, None]
+    V_C = np.asarray(V_C_grid, dtype=np.float64)[None, :]
+
+    K = V_B / V_C
+    mse_exists = (K_LOWER < K) & (K < K_UPPER)
+
+    # MSE branch, same constraints as analyze_group_B
+    f = K / (1 + K)
+    f_min = S_B / n_B if S_B < n_B else 0.0
+    f_max = np.where(S_C < n_B * (1 - f), 1 - S_C / n_B, 1.0)
+    # Not np.clip: when f_min > f_max (S_B + S_C > n_B) the scalar kernel's
+    # max(f_min, min(f, f_max)) resolves to f_min, but clip would pick f_max.
+    f = np.maximum(f_min, np.minimum(f, f_max))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        P_B = np.minimum(1.0, np.where(f > 0, S_B / (n_B * f), 0.0))
+        P_C = np.minimum(1.0, np.where(f < 1, S_C / (n_B * (1 - f)), 0.0))
+
+    # Corner branch: everyone moves to whichever type pays more
+    P_B_all = min(1.0, S_B / n_B)
+    P_C_all = min(1.0, S_C / n_B)
+    corner_B = P_B_all * V_B >= P_C_all * V_C
+
+    return {
+        'K': K,
+        'mse_exists': mse_exists,
+        'f': np.where(mse_exists, f, np.where(corner_B, 1.0, 0.0)),
+        'P_B': np.where(mse_exists, P_B, P_B_all),
+        'P_C': np.where(mse_exists, P_C, P_C_all)
+    }
+
+
+def analyze_jupas(params):
+    """Render the full analysis for a Params instance.
+
+    All numeric work happens in the cached analyze_group_A / analyze_group_B
+    helpers; this function only lays out the results.
+    """
 
-# Main analysis function
-def analyze_jupas(N, S, group_A_prop, V_A, V_B, V_C, seat_prop_A, seat_prop_B, seat_prop_C):
-    """Core analysis function following the paper's logic."""
-    
-    # Derived quantities
-    n_A = int(N * group_A_prop)
-    n_B = N - n_A
-    
-    S_A = int(S * seat_prop_A)
-    S_B = int(S * seat_prop_B)
-    S_C = int(S * seat_prop_C)
-    
     # Validate value ordering
-    if not (V_A > V_B > V_C):
-        st.error("Programme values must satisfy: V_A > V_B > V_C")
+    error = _validation_error(params)
+    if error is not None:
+        st.error(error)
         return None
-    
-    results = {}
-    
+
+    group_A = analyze_group_A(params)
+    group_B = analyze_group_B(params)
+    results = {'group_A': group_A, 'group_B': group_B}
+
     # Step 1: Group A Analysis
     st.header("Step 1: Group A Analysis")
-    
+
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Group A Applicants", f"{n_A:,}")
-        st.metric("Type A Seats", f"{S_A:,}")
-    
-    if n_A <= S_A:
-        admission_rate_A = 1.0
-        expected_payoff_A = V_A
+        st.metric("Group A Applicants", f"{group_A['n_A']:,}")
+        st.metric("Type A Seats", f"{group_A['S_A']:,}")
+
+    if group_A['admission_rate'] >= 1.0:
         status = "✅ All Group A can be admitted to Type A"
     else:
-        admission_rate_A = S_A / n_A
-        expected_payoff_A = admission_rate_A * V_A
-        status = f"⚠️ Only {admission_rate_A:.1%} of Group A can be admitted to Type A"
-    
+        status = f"⚠️ Only {group_A['admission_rate']:.1%} of Group A can be admitted to Type A"
+
     with col2:
-        st.metric("Admission Rate", f"{admission_rate_A:.1%}")
-        st.metric("Expected Payoff", f"{expected_payoff_A:.2f}")
-    
+        st.metric("Admission Rate", f"{group_A['admission_rate']:.1%}")
+        st.metric("Expected Payoff", f"{group_A['expected_payoff']:.2f}")
+
     st.info(status)
-    results['group_A'] = {'admission_rate': admission_rate_A, 'expected_payoff': expected_payoff_A}
-    
+
     # Step 2: Group B Analysis
     st.header("Step 2: Group B Analysis")
-    
+
+    K = group_B['K']
+    K_lower = group_B['K_lower']
+    K_upper = group_B['K_upper']
+
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Group B Applicants", f"{n_B:,}")
-        st.metric("Type B Seats", f"{S_B:,}")
-        st.metric("Type C Seats", f"{S_C:,}")
-    
-    # Calculate K = V_B / V_C
-    K = V_B / V_C
-    K_lower = 0.75  # 3/4
-    K_upper = 4/3   # ~1.333
-    
+        st.metric("Group B Applicants", f"{group_B['n_B']:,}")
+        st.metric("Type B Seats", f"{group_B['S_B']:,}")
+        st.metric("Type C Seats", f"{group_B['S_C']:,}")
+
     with col2:
         st.metric("K = V_B/V_C", f"{K:.3f}")
         st.metric("MSE Range", f"({K_lower:.3f}, {K_upper:.3f})")
-    
+
     # Check MSE condition
     st.subheader("Mixed Strategy Equilibrium (MSE) Analysis")
-    
-    if K_lower < K < K_upper:
+
+    if group_B['equilibrium_type'] == 'MSE':
         st.success(f"✅ MSE EXISTS (K = {K:.3f} is within range)")
-        
-        # Calculate equilibrium fraction f
-        f = K / (1 + K)
-        
-        # Apply probability constraints
-        f_min = S_B / n_B if S_B < n_B else 0
-        f_max = 1 - (S_C / n_B) if S_C < n_B * (1 - f) else 1
-        
-        # Adjust f to stay within constraints
-        f = max(f_min, min(f, f_max))
-        
-        # Calculate admission probabilities
-        P_B = S_B / (n_B * f) if f > 0 else 0
-        P_C = S_C / (n_B * (1 - f)) if f < 1 else 0
-        
-        # Cap probabilities at 1
-        P_B = min(P_B, 1.0)
-        P_C = min(P_C, 1.0)
-        
-        # Calculate expected payoffs
-        E_B = P_B * V_B
-        E_C = P_C * V_C
-        
-        # Display results
+
+        P_B, P_C = group_B['P_B'], group_B['P_C']
+        E_B, E_C = group_B['E_B'], group_B['E_C']
+
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Equilibrium f", f"{f:.3f}")
+            st.metric("Equilibrium f", f"{group_B['f']:.3f}")
             st.caption("Fraction choosing Type B")
         with col2:
             st.metric("P(B)", f"{P_B:.3f}")
@@ -164,185 +465,121 @@ def analyze_jupas(N, S, group_A_prop, V_A, V_B, V_C, seat_prop_A, seat_prop_B, s
         with col3:
             st.metric("P(C)", f"{P_C:.3f}")
             st.caption("Admission prob Type C")
-        
-        st.markdown(f"**Expected Payoffs:**")
-        st.markdown(f"- Type B: E(B) = {P_B:.3f} × {V_B:.1f} = **{E_B:.3f}**")
-        st.markdown(f"- Type C: E(C) = {P_C:.3f} × {V_C:.1f} = **{E_C:.3f}**")
-        
-        if abs(E_B - E_C) < 0.001:
+
+        st.markdown("**Equilibrium breakdown:**")
+        st.dataframe(_mse_frame(group_B['f'], P_B, P_C, E_B, E_C)
+                     .style.format("{:.3f}"))
+
+        if math.isclose(E_B, E_C, rel_tol=1e-3, abs_tol=1e-6):
             st.success("✅ Indifference condition holds (E_B ≈ E_C)")
         else:
             st.warning(f"⚠️ Small deviation: Δ = {abs(E_B - E_C):.4f}")
-        
-        results['group_B'] = {
-            'equilibrium_type': 'MSE',
-            'f': f,
-            'P_B': P_B,
-            'P_C': P_C,
-            'E_B': E_B,
-            'E_C': E_C
-        }
-        
+
     else:
         st.error(f"❌ MSE DOES NOT EXIST (K = {K:.3f} is outside range)")
-        
+
         # Analyze corner solutions
         st.subheader("Corner Solution Analysis")
-        
-        # Symmetric move analysis
-        P_B_all = min(1.0, S_B / n_B)
-        E_B_all = P_B_all * V_B
-        
-        P_C_all = min(1.0, S_C / n_B)
-        E_C_all = P_C_all * V_C
-        
-        # Determine which corner is better
-        if E_B_all > E_C_all:
-            preferred = "Type B"
-            equilibrium_type = "corner_B"
-            admission_rate = P_B_all
-            expected_payoff = E_B_all
-        elif E_C_all > E_B_all:
-            preferred = "Type C"
-            equilibrium_type = "corner_C"
-            admission_rate = P_C_all
-            expected_payoff = E_C_all
-        else:
-            preferred = "Indifferent"
-            equilibrium_type = "multiple"
-            admission_rate = P_B_all
-            expected_payoff = E_B_all
-        
+
+        # One markdown call per block keeps the number of messages sent to
+        # the frontend small; each st.markdown/st.info is a separate delta.
         col1, col2 = st.columns(2)
         with col1:
-            st.markdown("**All choose Type B:**")
-            st.markdown(f"- Admission rate: {P_B_all:.3f}")
-            st.markdown(f"- Expected payoff: {E_B_all:.3f}")
-        
+            st.markdown("**All choose Type B:**\n"
+                        f"- Admission rate: {group_B['P_B_all']:.3f}\n"
+                        f"- Expected payoff: {group_B['E_B_all']:.3f}")
+
         with col2:
-            st.markdown("**All choose Type C:**")
-            st.markdown(f"- Admission rate: {P_C_all:.3f}")
-            st.markdown(f"- Expected payoff: {E_C_all:.3f}")
-        
-        st.info(f"**Preferred corner:** {preferred}")
-        st.info(f"**Admission rate:** {admission_rate:.3f}")
-        st.info(f"**Expected payoff:** {expected_payoff:.3f}")
-        
-        # Asymmetric move analysis
-        st.subheader("Asymmetric Move Analysis")
-        
-        threshold_ratio = V_B / V_C
-        # For a switch to be rational: P_C > threshold_ratio × P_B
-        
-        # Quick check at boundaries
-        x_small = 1
-        P_B_small = min(1.0, S_B / (n_B - x_small))
-        P_C_small = min(1.0, S_C / x_small)
-        
-        x_half = n_B // 2
-        P_B_half = min(1.0, S_B / (n_B - x_half))
-        P_C_half = min(1.0, S_C / x_half)
-        
-        condition_small = P_C_small > threshold_ratio * P_B_small
-        condition_half = P_C_half > threshold_ratio * P_B_half
-        
-        st.markdown(f"**Threshold ratio:** {threshold_ratio:.3f} (V_B/V_C)")
-        st.markdown(f"**Condition at x=1:** P_C({P_C_small:.3f}) > {threshold_ratio:.3f} × P_B({P_B_small:.3f}) = {condition_small}")
-        st.markdown(f"**Condition at x=n_B/2:** P_C({P_C_half:.3f}) > {threshold_ratio:.3f} × P_B({P_B_half:.3f}) = {condition_half}")
-        
-        if not (condition_small or condition_half):
-            st.markdown("**Conclusion:** Switching to Type C is hard to rationalize")
-        
-        # Value adjustment suggestions
-        st.subheader("Value Adjustment Suggestions")
-        
-        if K <= K_lower:
-            target_K = (K_lower + K_upper) / 2
-            required_V_B = target_K * V_C
-            required_V_C = V_B / target_K
-            
-            st.markdown(f"**Issue:** K = {K:.3f} ≤ {K_lower:.3f} (too low)")
-            st.markdown("**To achieve MSE:**")
-            st.markdown(f"- Increase V_B to at least **{required_V_B:.2f}**")
-            st.markdown(f"- Or decrease V_C to at most **{required_V_C:.2f}**")
-            
-        elif K >= K_upper:
-            target_K = (K_lower + K_upper) / 2
-            required_V_B = target_K * V_C
-            required_V_C = V_B / target_K
-            
-            st.markdown(f"**Issue:** K = {K:.3f} ≥ {K_upper:.3f} (too high)")
-            st.markdown("**To achieve MSE:**")
-            st.markdown(f"- Decrease V_B to at most **{required_V_B:.2f}**")
-            st.markdown(f"- Or increase V_C to at least **{required_V_C:.2f}**")
-        
-        results['group_B'] = {
-            'equilibrium_type': equilibrium_type,
-            'preferred_corner': preferred,
-            'admission_rate': admission_rate,
-            'expected_payoff': expected_payoff,
-            'K': K,
-            'K_lower': K_lower,
-            'K_upper': K_upper
-        }
-    
+            st.markdown("**All choose Type C:**\n"
+                        f"- Admission rate: {group_B['P_C_all']:.3f}\n"
+                        f"- Expected payoff: {group_B['E_C_all']:.3f}")
+
+        st.info(f"**Preferred corner:** {group_B['preferred_corner']}  \n"
+                f"**Admission rate:** {group_B['admission_rate']:.3f}  \n"
+                f"**Expected payoff:** {group_B['expected_payoff']:.3f}")
+
+        # The asymmetric-move and value-adjustment write-ups are only worth
+        # rendering on request; the checkbox skips their Python-side cost too.
+        if st.checkbox("Show detailed diagnostics", value=False):
+            # Asymmetric move analysis
+            st.subheader("Asymmetric Move Analysis")
+
+            threshold_ratio = group_B['threshold_ratio']
+            if group_B['x_switch_min'] is not None:
+                st.markdown(f"**Threshold ratio:** {threshold_ratio:.3f} (V_B/V_C)\n\n"
+                            f"**Switching to Type C is rational** for some x "
+                            f"(smallest such x = {group_B['x_switch_min']:,})")
+            else:
+                st.markdown(f"**Threshold ratio:** {threshold_ratio:.3f} (V_B/V_C)\n\n"
+                            f"**Condition:** P_C(x) > {threshold_ratio:.3f} × P_B(x) "
+                            f"fails for every x in [1, {group_B['n_B'] - 1:,}]\n\n"
+                            "**Conclusion:** Switching to Type C is hard to rationalize")
+
+            # Value adjustment suggestions
+            st.subheader("Value Adjustment Suggestions")
+
+            if K <= K_lower:
+                st.markdown(f"**Issue:** K = {K:.3f} ≤ {K_lower:.3f} (too low)\n\n"
+                            "**To achieve MSE:**\n"
+                            f"- Increase V_B to at least **{group_B['required_V_B']:.2f}**\n"
+                            f"- Or decrease V_C to at most **{group_B['required_V_C']:.2f}**")
+
+            elif K >= K_upper:
+                st.markdown(f"**Issue:** K = {K:.3f} ≥ {K_upper:.3f} (too high)\n\n"
+                            "**To achieve MSE:**\n"
+                            f"- Decrease V_B to at most **{group_B['required_V_B']:.2f}**\n"
+                            f"- Or increase V_C to at least **{group_B['required_V_C']:.2f}**")
+
     return results
 
-# Run analysis with current parameters
-params = st.session_state.params
-
-try:
-    results = analyze_jupas(
-        params['N'], params['S'], params['group_A_prop'],
-        params['V_A'], params['V_B'], params['V_C'],
-        params['seat_prop_A'], params['seat_prop_B'], params['seat_prop_C']
-    )
-    
-    # Summary section
-    if results:
-        st.header("Summary")
-        
-        if results['group_B'].get('equilibrium_type') == 'MSE':
-            st.success(f"**Equilibrium Type:** Mixed Strategy Equilibrium")
-            st.info(f"**Fraction choosing Type B:** {results['group_B']['f']:.3f}")
-            st.info(f"**Expected payoff for Group B:** ~{results['group_B']['E_B']:.3f}")
-        else:
-            st.info(f"**Equilibrium Type:** Corner Solution ({results['group_B']['equilibrium_type']})")
-            st.info(f"**Preferred choice:** {results['group_B']['preferred_corner']}")
-            st.info(f"**Expected payoff for Group B:** {results['group_B']['expected_payoff']:.3f}")
-        
-        st.info(f"**Expected payoff for Group A:** {results['group_A']['expected_payoff']:.3f}")
-        
-except Exception as e:
-    st.error(f"Error in analysis: {str(e)}")
+# Run analysis with current parameters. analyze_jupas reports invalid input
+# via st.error and returns None, so no exception guard is needed here.
+params = Params(**st.session_state.params)
+results = analyze_jupas(params)
+
+# Summary section
+if results is not None:
+    st.header("Summary")
+
+    if results['group_B'].get('equilibrium_type') == 'MSE':
+        st.success(f"**Equilibrium Type:** Mixed Strategy Equilibrium")
+        st.info(f"**Fraction choosing Type B:** {results['group_B']['f']:.3f}")
+        st.info(f"**Expected payoff for Group B:** ~{results['group_B']['E_B']:.3f}")
+    else:
+        st.info(f"**Equilibrium Type:** Corner Solution ({results['group_B']['equilibrium_type']})")
+        st.info(f"**Preferred choice:** {results['group_B']['preferred_corner']}")
+        st.info(f"**Expected payoff for Group B:** {results['group_B']['expected_payoff']:.3f}")
+
+    st.info(f"**Expected payoff for Group A:** {results['group_A']['expected_payoff']:.3f}")
+
+    payoff_vec = (params.V_A, params.V_B, params.V_C)
+    seat_vec = (results['group_A']['S_A'],
+                results['group_B']['S_B'],
+                results['group_B']['S_C'])
+    alloc = _allocate_core(payoff_vec, seat_vec, params.N)
+    total_value = float(np.dot(alloc, payoff_vec))
+    st.caption("Greedy fill if all applicants ranked types by value "
+               f"(total value {total_value:,.1f}):")
+    st.dataframe(_greedy_fill_frame(payoff_vec, seat_vec, params.N))
 
 # Quick analysis examples
 st.sidebar.header("Quick Examples")
-if st.sidebar.button("Situation 4 (Default)"):
-    st.session_state.params = {
-        'N': 10000, 'S': 9000, 'group_A_prop': 0.3,
-        'V_A': 3.0, 'V_B': 2.0, 'V_C': 1.0,
-        'seat_prop_A': 1/3, 'seat_prop_B': 1/3, 'seat_prop_C': 1/3
-    }
-    st.rerun()
-
-if st.sidebar.button("Situation 5 (MSE Example)"):
-    st.session_state.params = {
-        'N': 10000, 'S': 9000, 'group_A_prop': 0.3,
-        'V_A': 3.0, 'V_B': 1.2, 'V_C': 1.0,  # K = 1.2, within MSE range
-        'seat_prop_A': 1/3, 'seat_prop_B': 1/3, 'seat_prop_C': 1/3
-    }
-    st.rerun()
+preset_captions = _preset_table()
 
-if st.sidebar.button("High Competition"):
-    st.session_state.params = {
-        'N': 15000, 'S': 9000, 'group_A_prop': 0.4,
-        'V_A': 5.0, 'V_B': 3.0, 'V_C': 1.5,
-        'seat_prop_A': 0.4, 'seat_prop_B': 0.4, 'seat_prop_C': 0.2
-    }
-    st.rerun()
+# Applying a preset that already matches the current parameters would only
+# trigger a redundant rerun, so compare before rewriting state. Only the
+# widget-driven keys are compared, via isclose: seat_prop_C is recomputed
+# from the sliders each rerun, so it drifts from the preset literal by
+# float rounding (1 - 1/3 - 1/3 != 1/3 exactly).
+for label, preset in _PRESETS.items():
+    applied = all(math.isclose(st.session_state.params[k], v)
+                  for k, v in preset.items() if k != 'seat_prop_C')
+    if st.sidebar.button(label) and not applied:
+        st.session_state.params = dict(preset)
+        st.rerun()
+    st.sidebar.caption(preset_captions[label])
 
 # Display current parameters
 with st.sidebar.expander("Current Parameters"):
     st.json(st.session_state.params)
-    
+
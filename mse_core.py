@@ -0,0 +1,70 @@
+"""Shared mixed-strategy-equilibrium arithmetic for the JUPAS tools.
+
+Kept free of Streamlit imports so every front end shares one kernel (and
+one warm numba cache, when numba is installed).
+"""
+import functools
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernel runs fine as plain Python
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+
+@functools.lru_cache(maxsize=128)
+def compute_mse(n_B, S_B, S_C, V_B, V_C):
+    """Cached front door to the MSE kernel.
+
+    Returns (f, P_B, P_C, E_B, E_C, regime) where regime says which
+    probability constraint on f binds: 'interior' (none), 'B_seats_binding'
+    (f raised to S_B/n_B) or 'C_seats_binding' (f lowered to 1 - S_C/n_B).
+    lru_cache keeps repeated calls O(1) even outside Streamlit (scripts,
+    unit tests), where st.cache_data is unavailable.
+    """
+    f, P_B, P_C, E_B, E_C = _mse_kernel(n_B, S_B, S_C, V_B, V_C)
+    # f = K/(1+K) is strictly inside (0, 1) for positive values, so all-B /
+    # all-C corners cannot occur here; the observable regimes are the seat
+    # constraints pulling f away from the indifference point.
+    K = V_B / V_C
+    f_interior = K / (1.0 + K)
+    if f > f_interior:
+        regime = 'B_seats_binding'
+    elif f < f_interior:
+        regime = 'C_seats_binding'
+    else:
+        regime = 'interior'
+    return f, P_B, P_C, E_B, E_C, regime
+
+
+@njit(cache=True)
+def _mse_kernel(n_B, S_B, S_C, V_B, V_C):
+    """Scalar MSE arithmetic: equilibrium fraction, admission probabilities
+    and expected payoffs. Self-contained so numba can compile it to native
+    code when available."""
+    K = V_B / V_C
+    f = K / (1.0 + K)
+
+    # Probability constraints on f
+    f_min = S_B / n_B if S_B < n_B else 0.0
+    f_max = 1.0 - S_C / n_B if S_C < n_B * (1.0 - f) else 1.0
+
+    if f_min <= f <= f_max:
+        # Unconstrained interior point: n_B*f = n_B*K/(1+K) and
+        # n_B*(1-f) = n_B/(1+K), so the probabilities take closed forms
+        # with no f > 0 / f < 1 guards.
+        one_plus_K = 1.0 + K
+        P_B = S_B * one_plus_K / (n_B * K)
+        P_C = S_C * one_plus_K / n_B
+    else:
+        f = max(f_min, min(f, f_max))
+        P_B = S_B / (n_B * f) if f > 0 else 0.0
+        P_C = S_C / (n_B * (1.0 - f)) if f < 1 else 0.0
+
+    # Cap probabilities at 1 (inline conditionals avoid the min() call)
+    P_B = P_B if P_B < 1.0 else 1.0
+    P_C = P_C if P_C < 1.0 else 1.0
+
+    return f, P_B, P_C, P_B * V_B, P_C * V_C